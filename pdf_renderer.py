@@ -41,6 +41,12 @@ GRAY_BORDER = colors.HexColor('#d0d8dc')
 
 from pdf_resume_updater import PDFResumeUpdater
 
+# Display-text cleanup patterns, compiled once
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_LIST_NUMBER_RE = re.compile(r'^\s*\d+\.\s*')  # "1. ", "2. "
+_BULLET_MARKER_RE = re.compile(r'^[•\-–—]\s*')  # "• ", "- ", "– "
+_STRAY_PREFIX_RE = re.compile(r'^.\s+(?=[A-Z])')  # single char + space before uppercase
+
 
 def _section_has_summary_items(section: Dict[str, Any]) -> bool:
     """True if section has summary-like items (items with 'text')."""
@@ -103,9 +109,8 @@ class PDFRenderer:
     """Renders resume JSON data into a visual PDF."""
     
     def __init__(self, json_data: Dict[str, Any]):
-        # CRITICAL: Make a deep copy to avoid reference issues
-        import copy
-        self.data = copy.deepcopy(json_data)
+        # Rendering only reads json_data (no item or section is ever assigned), so no copy is made
+        self.data = json_data
         self.style = self.data.get('style', {})
         self.header = self.data.get('header', {})
         self.sections = self.data.get('sections', [])
@@ -122,7 +127,7 @@ class PDFRenderer:
         if not text:
             return ""
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _HTML_TAG_RE.sub('', text)
         # Decode HTML entities
         text = text.replace('&nbsp;', ' ')
         text = text.replace('&amp;', '&')
@@ -169,8 +174,8 @@ class PDFRenderer:
             return raw or ""
         s = raw.strip()
         # Remove leading numbering ("1. ", "2. "), bullets ("• ", "- ", "– "), or stray "n " (corrupted marker)
-        s = re.sub(r'^\s*\d+\.\s*', '', s)
-        s = re.sub(r'^[•\-–—]\s*', '', s)
+        s = _LIST_NUMBER_RE.sub('', s)
+        s = _BULLET_MARKER_RE.sub('', s)
         # Strip single leading char when followed by space (handles "n ", "1 ", or mis-encoded bullet)
         if len(s) > 2 and s[1] in (' ', '\t') and (
             s[0] in ('n', 'N') or (s[2:3] and s[2].isupper())
@@ -183,11 +188,11 @@ class PDFRenderer:
         if not raw or not isinstance(raw, str):
             return raw or ""
         s = raw.strip()
-        s = re.sub(r'^\s*\d+\.\s*', '', s)
-        s = re.sub(r'^[•\-–—]\s*', '', s)
+        s = _LIST_NUMBER_RE.sub('', s)
+        s = _BULLET_MARKER_RE.sub('', s)
         # Strip any single character + space when followed by uppercase (loop for multiple prefixes)
         while True:
-            s2 = re.sub(r'^.\s+(?=[A-Z])', '', s)
+            s2 = _STRAY_PREFIX_RE.sub('', s)
             if s2 == s:
                 break
             s = s2.strip()
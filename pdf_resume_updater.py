@@ -7,11 +7,11 @@ The PDF contains embedded JSON data in the /ecv-data field that stores all resum
 """
 
 import json
+import os
 import re
 import sys
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
-import argparse
 
 
 def _safe_print(*args, **kwargs):
@@ -24,6 +24,18 @@ def _safe_print(*args, **kwargs):
         print(*safe_args, **kwargs)
 
 
+# /ecv-data field patterns, tried in order to handle various formats
+_ECV_DATA_READ_PATTERNS = (
+    re.compile(rb'/ecv-data\s*<FEFF([^>]+)>'),  # Standard format
+    re.compile(rb'/ecv-data\s*<FE\s*FF([^>]+)>'),  # Space-separated FE FF
+    re.compile(rb'/ecv-data\s*<FE\s*FF\s*([^>]+)>'),  # More spaces
+)
+_ECV_DATA_WRITE_PATTERNS = (
+    re.compile(rb'/ecv-data\s*<FEFF[^>]+>'),  # Standard format
+    re.compile(rb'/ecv-data\s*<FE\s*FF[^>]+>'),  # Space-separated FE FF
+)
+
+
 class PDFResumeUpdater:
     """Tool to update Enhancv PDF resume content."""
     
@@ -32,25 +44,25 @@ class PDFResumeUpdater:
         if not self.pdf_path.exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         self.data = None
+        self._pdf_bytes: Optional[bytes] = None
+        
+    def _read_pdf_bytes(self) -> bytes:
+        """Return the original PDF bytes, reading from disk only once."""
+        if self._pdf_bytes is None:
+            with open(self.pdf_path, 'rb') as f:
+                self._pdf_bytes = f.read()
+        return self._pdf_bytes
         
     def extract_json_data(self) -> Dict[str, Any]:
         """Extract embedded JSON data from PDF."""
         try:
-            with open(self.pdf_path, 'rb') as f:
-                content = f.read()
+            content = self._read_pdf_bytes()
             
             # Find the /ecv-data field in the PDF
             # It's stored as a hex-encoded UTF-16 string
-            # Try different patterns to handle various formats
-            patterns = [
-                rb'/ecv-data\s*<FEFF([^>]+)>',  # Standard format
-                rb'/ecv-data\s*<FE\s*FF([^>]+)>',  # Space-separated FE FF
-                rb'/ecv-data\s*<FE\s*FF\s*([^>]+)>',  # More spaces
-            ]
-            
             match = None
-            for pattern in patterns:
-                match = re.search(pattern, content)
+            for pattern in _ECV_DATA_READ_PATTERNS:
+                match = pattern.search(content)
                 if match:
                     break
             
@@ -276,9 +288,9 @@ class PDFResumeUpdater:
         
         # Update items
         tech_section['items'] = []
-        for title, tags in skill_groups.items():
+        for i, (title, tags) in enumerate(skill_groups.items()):
             tech_item = {
-                'id': f'skill_{len(tech_section["items"])}',
+                'id': f'skill_{i}',
                 'record': 'TechnologyItem',
                 'title': title,
                 'description': '',
@@ -315,35 +327,32 @@ class PDFResumeUpdater:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            # Read original PDF
-            with open(self.pdf_path, 'rb') as f:
-                pdf_content = f.read()
+            # Read original PDF (cached from extract_json_data when available)
+            pdf_content = self._read_pdf_bytes()
             
-            # Convert updated data to JSON string
-            json_str = json.dumps(self.data, ensure_ascii=False)
+            # Convert updated data to compact JSON string (not human-read; keeps blob small)
+            json_str = json.dumps(self.data, ensure_ascii=False, separators=(',', ':'))
             
             # Encode as UTF-16-BE with BOM
             json_bytes = json_str.encode('utf-16-be')
             
             # Convert to hex with FEFF BOM prefix
-            hex_data = 'FEFF' + json_bytes.hex().upper()
-            
-            # Format hex with spaces (every 2 characters)
-            hex_formatted = ' '.join(hex_data[i:i+2] for i in range(0, len(hex_data), 2))
+            hex_bytes = b'FEFF' + json_bytes.hex().upper().encode('ascii')
+
+            # Format hex with spaces (every 2 characters) using strided copies
+            n = len(hex_bytes)
+            spaced = bytearray(b' ' * (3 * n // 2))
+            spaced[0::3] = hex_bytes[0::2]
+            spaced[1::3] = hex_bytes[1::2]
+            hex_formatted = spaced[:-1].decode('ascii')
             
             # Replace the ecv-data field
-            # Try multiple patterns to handle different formats
-            patterns = [
-                rb'/ecv-data\s*<FEFF[^>]+>',  # Standard format
-                rb'/ecv-data\s*<FE\s*FF[^>]+>',  # Space-separated FE FF
-            ]
-            
             replacement = f'/ecv-data <{hex_formatted}>'.encode('ascii')
             new_content = pdf_content
             
-            for pattern in patterns:
-                if re.search(pattern, new_content):
-                    new_content = re.sub(pattern, replacement, new_content)
+            for pattern in _ECV_DATA_WRITE_PATTERNS:
+                new_content, replaced = pattern.subn(replacement, new_content)
+                if replaced:
                     break
             else:
                 # If no pattern matched, try to find and replace manually
@@ -372,42 +381,42 @@ class PDFResumeUpdater:
                     f"Error: {e}"
                 )
             
+            # Keep the cached bytes in sync when the source PDF was overwritten
+            if output_path.resolve() == self.pdf_path.resolve():
+                self._pdf_bytes = new_content
+            
             _safe_print(f"Successfully saved updated PDF to: {output_path}")
             
             # Optionally render visual PDF
             if render_visual:
+                # Import separately so a genuine render failure is never reported as "not installed"
                 try:
                     from pdf_renderer import PDFRenderer
-                    visual_path = str(Path(output_path).with_suffix('.visual.pdf'))
-                    
-                    summary_for_render = ""
-                    for section in self.data.get('sections', []):
-                        if section.get('__t') == 'SummarySection':
-                            if section.get('items'):
-                                summary_for_render = section['items'][0].get('text', '')
-                                break
-                    
-                    # CRITICAL: Make a deep copy to ensure renderer gets the exact data we have
-                    import copy
-                    data_for_renderer = copy.deepcopy(self.data)
-                    
-                    # CRITICAL: Pass self.data (which should have updates) to renderer
-                    renderer = PDFRenderer(data_for_renderer)
-                    
-                    renderer.render_pdf(visual_path)
-                    visual_path_result = visual_path
-                    _safe_print(f"Rendered visual PDF to: {visual_path}")
-                except ImportError as e:
+                except ImportError:
+                    PDFRenderer = None
                     visual_error_result = "Visual PDF not available (install weasyprint or reportlab)."
                     _safe_print("Visual rendering not available. Install: pip install weasyprint")
-                except Exception as e:
-                    visual_error_result = str(e)
-                    _safe_print(f"Visual rendering failed: {e}")
-                    import traceback
+                
+                if PDFRenderer is not None:
                     try:
-                        traceback.print_exc()
-                    except UnicodeEncodeError:
-                        _safe_print("Visual rendering failed (see error above)")
+                        visual_path = str(Path(output_path).with_suffix('.visual.pdf'))
+                        
+                        # CRITICAL: Pass self.data (which should have updates) to renderer
+                        renderer = PDFRenderer(self.data)
+                        
+                        renderer.render_pdf(visual_path)
+                        visual_path_result = visual_path
+                        _safe_print(f"Rendered visual PDF to: {visual_path}")
+                    except Exception as e:
+                        visual_error_result = str(e)
+                        _safe_print(f"Visual rendering failed: {e}")
+                        # Full traceback only on request (set PDF_RESUME_DEBUG=1)
+                        if os.environ.get('PDF_RESUME_DEBUG'):
+                            import traceback
+                            try:
+                                traceback.print_exc()
+                            except UnicodeEncodeError:
+                                _safe_print("Visual rendering failed (see error above)")
             
         except Exception as e:
             # Use ASCII-safe message so GUI/console on Windows never hits charmap
@@ -442,6 +451,8 @@ class PDFResumeUpdater:
 
 
 def main():
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Update content in Enhancv PDF resumes',
         formatter_class=argparse.RawDescriptionHelpFormatter,
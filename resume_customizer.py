@@ -10,12 +10,10 @@ import json
 import logging
 import os
 import sys
-import copy
-import shutil
-import platform
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-import argparse
+from typing import Callable, Dict, Any, List, Optional
 import re
 from datetime import datetime
 
@@ -34,13 +32,134 @@ def _ensure_debug_log():
     h.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
     _log.addHandler(h)
 
+from pdf_resume_updater import PDFResumeUpdater
+
+# jiter ships with the openai SDK; it also parses incomplete JSON while a reply streams in
 try:
-    from openai import OpenAI
+    import jiter
 except ImportError:
-    print("Error: openai package not installed. Install with: pip install openai")
-    sys.exit(1)
+    jiter = None
+
+# Optional faster JSON parser for API responses: orjson, else jiter, else json.
+# Every variant raises json.JSONDecodeError on invalid input.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional lenient parser for model replies with trailing commas, comments or single quotes
+try:
+    import json5
+except ImportError:
+    json5 = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+elif jiter is None:
+    _json_loads = json.loads
+else:
+    def _json_loads(content):
+        """Parse JSON with jiter, raising json.JSONDecodeError like json.loads."""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        try:
+            return jiter.from_json(data, cache_mode='keys')
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), data.decode('utf-8', errors='replace'), 0)
+
+
+# Markdown code fence around a whole reply (some models add one even in JSON mode)
+_CODE_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+
+
+def _loads_model_json(content: str) -> Any:
+    """Parse a model's JSON reply, repairing the usual slips before giving up.
+    
+    Tries strict JSON, then again without a surrounding code fence, then json5 when installed.
+    Raises json.JSONDecodeError if none of them parse.
+    """
+    try:
+        return _json_loads(content)
+    except json.JSONDecodeError as e:
+        error = e
+    unfenced = _CODE_FENCE_RE.sub('', content)
+    if unfenced != content:
+        try:
+            return _json_loads(unfenced)
+        except json.JSONDecodeError as e:
+            error = e
+    if json5 is not None:
+        try:
+            return json5.loads(unfenced)
+        except ValueError:
+            pass
+    raise error
+
+
+def _write_json_file(path: Path, data: Dict[str, Any]):
+    """Write data as 2-space indented UTF-8 JSON; orjson encodes straight to bytes when installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# Emoji/symbol blocks stripped by clean_text (one character class, compiled once)
+_EMOJI_RE = re.compile(
+    '[\U00002600-\U000027BF'    # Misc symbols, dingbats
+    '\U0001F300-\U0001FAFF]'    # Pictographs, emoticons, transport, extended symbols
+)
+_MULTISPACE_RE = re.compile(r' +')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Experience years in a summary ("10+", "over 8 years"); at a digit the bare number is taken,
+# so "5 years" yields "5"
+_EXPERIENCE_YEARS_RE = re.compile(r'over\s+\d+\s*years?|\d+\+?', re.IGNORECASE)
+
+# Leading "1." and/or bullet marker on project titles, removed in one pass
+_PROJECT_TITLE_PREFIX_RE = re.compile(r'^\s*(?:\d+\.\s*)?(?:[•\-–—]\s*)?')
+
+# HTML tags in model output, punctuation-only words (apply_updates)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_NON_WORD_RE = re.compile(r'^[^\w]+$')
+
+# extract_job_title: labelled title line first, then a leading role-like line
+_JOB_TITLE_PATTERN_SOURCES = (
+    r'(?:JOB\s*TITLE|Position|Title|Role|Job Title|POSITION|TITLE|ROLE)[:\s]+([^\n]+)',
+    r'^([A-Z][A-Za-z\s&]+(?:Engineer|Developer|Architect|Specialist|Manager|Analyst|Consultant|Lead|Senior|Junior)[^\n]*)',
+)
+# The role-line pattern backtracks quadratically on long unpunctuated text (its [A-Za-z\s&]+
+# runs across lines from every line start); google-re2 matches in linear time when installed.
+# Input is clean_text output (printable ASCII, tab, newline), where RE2's ASCII-only \s and re's agree.
+try:
+    import re2
+    _JOB_TITLE_PATTERNS = [re2.compile('(?im)' + p) for p in _JOB_TITLE_PATTERN_SOURCES]
+except Exception:
+    # Not installed, or a different package named re2 that cannot compile these patterns
+    _JOB_TITLE_PATTERNS = [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in _JOB_TITLE_PATTERN_SOURCES]
+_NON_TITLE_CHARS_RE = re.compile(r'[^\w\s\-&]')
+
+# normalize_for_matching: single-char dashes via translate, then entities and whitespace runs
+# in one regex pass (&nbsp; counts as whitespace, so a run of both collapses to one space)
+_MATCH_DASH_TABLE = str.maketrans({'\u2013': '-', '\u2014': '-'})
+_MATCH_ENTITY_RE = re.compile(r'(?:\s|&nbsp;)+|&amp;|&')
+_MATCH_ENTITY_REPLACEMENTS = {'&amp;': 'and', '&': 'and'}
 
-from pdf_resume_updater import PDFResumeUpdater
+
+class _PrintableAsciiTable(dict):
+    """str.translate table: printable ASCII, newline and tab map to themselves, anything else to a space.
+
+    Entries for non-ASCII code points are filled in on first lookup, so the table stays small.
+    """
+
+    def __missing__(self, codepoint):
+        self[codepoint] = ' '
+        return ' '
+
+
+_PRINTABLE_ASCII_TABLE = _PrintableAsciiTable(
+    (c, c if (32 <= c <= 126) or c in (9, 10) else ' ') for c in range(128)
+)
 
 
 def normalize_for_matching(text):
@@ -54,17 +173,29 @@ def normalize_for_matching(text):
         except:
             return ""
     
+    return _normalize_str(text)
+
+
+def _match_entity_repl(m) -> str:
+    """re.sub callback for _MATCH_ENTITY_RE."""
+    return _MATCH_ENTITY_REPLACEMENTS.get(m.group(0), ' ')
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_str(text: str) -> str:
+    """Cached worker for normalize_for_matching; the same titles are normalized on every match."""
     # Normalize special characters for matching
-    text = text.replace('–', '-')  # En dash to hyphen
-    text = text.replace('—', '-')  # Em dash to hyphen
-    text = text.replace('&', 'and')  # Ampersand to 'and'
-    text = text.replace('&amp;', 'and')  # HTML entity
-    text = text.replace('&nbsp;', ' ')  # HTML entity
-    text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+    text = text.translate(_MATCH_DASH_TABLE)  # En/em dash to hyphen
+    text = _MATCH_ENTITY_RE.sub(_match_entity_repl, text)  # &amp; / & to "and", whitespace / &nbsp; to one space
     
     return text.lower().strip()
 
 
+def _match_words(norm_text: str) -> set:
+    """Word set of already-normalized text, ignoring punctuation-only words."""
+    return {w for w in norm_text.split() if w and not _NON_WORD_RE.match(w)}
+
+
 def clean_text(text):
     """Remove all emojis and non-ASCII characters from text."""
     if not text:
@@ -76,26 +207,45 @@ def clean_text(text):
         except:
             return ""
     
+    return _clean_str(text)
+
+
+def clean_text_batch(texts) -> List[str]:
+    """Clean a list of short strings (bullets, tags) with a single clean_text pass.
+    
+    Items are joined on newlines, which clean_text already treats line by line, so the
+    result matches [clean_text(t) for t in texts]. Items that are not single-line
+    strings fall back to per-item cleaning.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if not all(isinstance(t, str) and '\n' not in t for t in texts):
+        return [clean_text(t) for t in texts]
     try:
-        # Remove emojis and symbols
-        text = re.sub(r'[\U0001F300-\U0001F9FF]', '', text)
-        text = re.sub(r'[\U00002600-\U000027BF]', '', text)
-        text = re.sub(r'[\U0001F600-\U0001F64F]', '', text)
-        text = re.sub(r'[\U0001F680-\U0001F6FF]', '', text)
-        text = re.sub(r'[\U0001F700-\U0001F7FF]', '', text)
-        text = re.sub(r'[\U0001F800-\U0001F8FF]', '', text)
-        text = re.sub(r'[\U0001F900-\U0001F9FF]', '', text)
-        text = re.sub(r'[\U0001FA00-\U0001FAFF]', '', text)
-        
-        # Keep only printable ASCII (32-126) plus newlines and tabs
-        cleaned = ''.join(char if (32 <= ord(char) <= 126) or char in '\n\t' else ' ' 
-                          for char in text)
-        
-        # Reduce multiple spaces (but preserve newlines)
-        # First, reduce multiple spaces within lines
-        lines = cleaned.split('\n')
-        cleaned_lines = [re.sub(r' +', ' ', line).strip() for line in lines]
-        cleaned = '\n'.join(cleaned_lines)
+        return _clean_lines('\n'.join(texts))
+    except Exception:
+        return [clean_text(t) for t in texts]
+
+
+def _clean_lines(text: str) -> List[str]:
+    """Strip emojis and non-printable characters, then collapse spaces on each line."""
+    # Remove emojis and symbols (all outside ASCII, so pure-ASCII text skips the scan)
+    if not text.isascii():
+        text = _EMOJI_RE.sub('', text)
+    
+    # Keep only printable ASCII (32-126) plus newlines and tabs; ASCII control characters still become spaces
+    cleaned = text.translate(_PRINTABLE_ASCII_TABLE)
+    
+    # Reduce multiple spaces within lines (but preserve newlines)
+    return [_MULTISPACE_RE.sub(' ', line).strip() for line in cleaned.split('\n')]
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_str(text: str) -> str:
+    """Cached worker for clean_text; the same job description and fields are cleaned many times per run."""
+    try:
+        cleaned = '\n'.join(_clean_lines(text))
         
         # Remove empty lines at start/end but keep internal structure
         cleaned = cleaned.strip()
@@ -124,6 +274,20 @@ def safe_str(obj, max_len=None):
     return s
 
 
+_IS_WINDOWS = sys.platform == 'win32'
+
+# Windows invalid filename characters map to '_', control characters (0-31) are removed
+_WINDOWS_FILENAME_TABLE = {c: None for c in range(32)}
+_WINDOWS_FILENAME_TABLE.update({ord(c): '_' for c in '<>:"/\\|?*'})
+
+# Windows reserved names (case-insensitive)
+_WINDOWS_RESERVED_NAMES = frozenset({
+    'CON', 'PRN', 'AUX', 'NUL',
+    'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
+    'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
+})
+
+
 def sanitize_windows_filename(name: str, max_length: int = 255) -> str:
     """Sanitize a filename for Windows compatibility.
     
@@ -133,23 +297,12 @@ def sanitize_windows_filename(name: str, max_length: int = 255) -> str:
     if not name:
         return "unnamed"
     
-    # Windows invalid characters: < > : " / \ | ? *
-    invalid_chars = r'[<>:"/\\|?*]'
-    name = re.sub(invalid_chars, '_', name)
-    
-    # Remove control characters (0-31)
-    name = ''.join(char for char in name if ord(char) >= 32)
-    
-    # Windows reserved names (case-insensitive)
-    reserved_names = {
-        'CON', 'PRN', 'AUX', 'NUL',
-        'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-        'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-    }
+    # Replace Windows invalid characters (< > : " / \ | ? *) and drop control characters (0-31)
+    name = name.translate(_WINDOWS_FILENAME_TABLE)
     
     # Check if name (without extension) is reserved
     name_base = name.rsplit('.', 1)[0].upper()
-    if name_base in reserved_names or name_base.endswith('.'):
+    if name_base in _WINDOWS_RESERVED_NAMES or name_base.endswith('.'):
         name = '_' + name
     
     # Remove leading/trailing spaces and dots (Windows doesn't allow these)
@@ -178,9 +331,13 @@ def sanitize_windows_path(path: Path, max_path_length: int = 240) -> Path:
     Windows has a 260 character path limit by default.
     We use 240 to leave room for the filename.
     """
-    if platform.system() != 'Windows':
+    if not _IS_WINDOWS:
         return path
-    
+    return _sanitize_windows_path_impl(path, max_path_length)
+
+
+def _sanitize_windows_path_impl(path: Path, max_path_length: int) -> Path:
+    """Windows-only body of sanitize_windows_path."""
     # Get parts
     parts = list(path.parts)
     drive_root = (path.drive + path.root) if path.drive else None
@@ -203,37 +360,29 @@ def sanitize_windows_path(path: Path, max_path_length: int = 240) -> Path:
     if len(path_str) > max_path_length:
         # Try to shorten the filename part
         if sanitized_path.is_absolute():
-            # Get drive and root
-            drive = sanitized_path.drive
-            root = sanitized_path.root
-            remaining = max_path_length - len(drive) - len(root) - 10  # Safety margin
-            
-            # Shorten the last part (filename)
-            parts = list(sanitized_path.parts[2:])  # Skip drive and root
+            # parts[0] is the whole anchor (drive + root, e.g. 'C:\\'); keep every directory after it
+            parts = list(sanitized_path.parts[1:])
             if parts:
+                remaining = max_path_length - len(sanitized_path.anchor) - 10  # Safety margin
+                remaining -= sum(len(p) + 1 for p in parts[:-1])
+                
+                # Shorten the last part (filename)
                 last_part = parts[-1]
                 if '.' in last_part:
                     base, ext = last_part.rsplit('.', 1)
-                    max_base = remaining - len(ext) - 1 - sum(len(p) + 1 for p in parts[:-1])
-                    if max_base > 10:
-                        parts[-1] = base[:max_base] + '.' + ext
-                    else:
-                        parts[-1] = 'file.' + ext
+                    max_base = remaining - len(ext) - 1
+                    parts[-1] = base[:max_base] + '.' + ext if max_base > 10 else 'file.' + ext
                 else:
-                    max_len = remaining - sum(len(p) + 1 for p in parts[:-1])
-                    if max_len > 10:
-                        parts[-1] = last_part[:max_len]
-                    else:
-                        parts[-1] = 'file'
+                    parts[-1] = last_part[:remaining] if remaining > 10 else 'file'
                 
-                sanitized_path = Path(drive, root, *parts)
+                sanitized_path = Path(sanitized_path.anchor, *parts)
     
     return sanitized_path
 
 
 def setup_windows_console():
     """Setup Windows console for UTF-8 encoding if on Windows."""
-    if platform.system() == 'Windows':
+    if _IS_WINDOWS:
         try:
             # Set console code page to UTF-8
             import ctypes
@@ -244,10 +393,210 @@ def setup_windows_console():
             pass  # Silently fail if not in console or can't set
 
 
+# On-disk cache of model replies, keyed by a hash of the request; enabled with NOVA_LLM_CACHE=1
+_LLM_CACHE_DIR = Path.home() / '.cache' / 'nova_resume' / 'llm'
+
+# System prompts are constant; clean them once at import instead of per API call
+_SUMMARY_SYSTEM_MSG = clean_text(
+    "You are an expert resume writer. Match the job's requirements and keywords, but never downgrade the candidate's level (e.g. if the job is junior, keep the profile senior and professional). Always present the profile as professionally as possible."
+)
+_EXPERIENCE_SYSTEM_MSG = clean_text(
+    "You are an expert resume writer. Match the job's requirements and keywords; never downgrade the candidate's level (e.g. keep senior/lead language even for junior roles). Always return valid JSON."
+)
+_PROJECTS_SYSTEM_MSG = clean_text(
+    "You are an expert resume writer. Match the job's requirements and keywords; never downgrade the candidate's level. Present the profile as professionally as possible. Always return valid JSON."
+)
+_SKILLS_SYSTEM_MSG = clean_text(
+    "You are an expert resume writer. Always return valid JSON. The skills section must match the job's tech stack exactly so ATS and AI detect the resume as a strong match."
+)
+
+
+# User prompt templates (str.format fields; literal braces are doubled)
+_SUMMARY_PROMPT_TEMPLATE = """You are an expert resume writer. The resume must PERFECTLY match the job description. Your task is to rewrite the summary so it meets ALL requirements of the job description.
+
+Current Summary:
+{summary}
+
+Job Description:
+{job_description}
+
+CRITICAL - PERFECT MATCH WITH JOB:
+1. The summary must meet ALL key requirements of the job (technologies, skills, responsibilities) using the EXACT same wording as the job - but do NOT downgrade the candidate's level.
+2. If the job is junior or mid-level, do NOT make the summary sound junior. Always present the profile as professionally as possible: preserve the candidate's actual seniority, leadership, and scope. A senior candidate applying to a junior role should still sound senior and professional.
+3. Extract requirements from the job (technologies, methodologies, role type) and address them with exact keywords - never reduce or tone down the candidate's experience level to match the job level.
+4. Use the EXACT terminology from the job (e.g. ".NET Core", "Azure", "microservices"). Keep the summary concise - 3-4 sentences (80-120 words).
+5. Preserve the experience years exactly as "{experience_years}" if it appears in the original summary.
+6. Keep all information truthful - only rephrase existing experience; do not invent new experience. Remove ALL HTML tags - return plain text only.
+
+Return ONLY the customized summary text, no explanations or additional text."""
+
+_EXPERIENCE_PROMPT_TEMPLATE = """You are an expert resume writer. The resume must PERFECTLY match the job description. Your task is to rewrite experience bullets so they meet ALL requirements of the job description.
+
+Job Description:
+{job_description}
+
+Current Experiences:
+{experiences}
+
+CRITICAL - PERFECT MATCH WITH JOB:
+1. The experience section must meet ALL key requirements of the job (technologies, responsibilities, qualifications) using the EXACT keywords from the job - but do NOT downgrade the candidate's level.
+2. If the job is junior or mid-level, do NOT make the experience sound junior. Always present the profile as professionally as possible: keep leadership, scope, ownership, and seniority. A senior candidate's bullets should still show senior/lead-level impact (e.g. led, architected, mentored) even when applying to a junior role.
+3. For EACH experience, write bullets that prove the candidate has what the job asks for - use EXACT keywords and phrases from the job. Do not tone down achievements or reduce responsibility level to match the job.
+4. Make bullets concise but impactful with metrics; each bullet 1 sentence. Use 3-4 bullets per experience. Keep all information truthful - only expand and rephrase existing achievements.
+5. ABSOLUTELY CRITICAL: Use the EXACT position name and company name from "Current Experiences" - DO NOT change them. Return them EXACTLY as in the input.
+
+Return results as a JSON object with "experiences" key containing an array:
+   {{
+     "experiences": [
+       {{
+         "position": "EXACT position name from above",
+         "company": "EXACT company name from above",
+         "bullets": ["detailed bullet 1 with metrics and job-relevant keywords", "detailed bullet 2", "detailed bullet 3", "detailed bullet 4", "detailed bullet 5"]
+       }}
+     ]
+   }}
+
+Return ONLY the JSON object with "experiences" key, no additional text."""
+
+_PROJECTS_PROMPT_TEMPLATE = """You are an expert resume writer. The resume must PERFECTLY match the job description. Your task is to rewrite project descriptions and bullets so they meet ALL requirements of the job description.
+
+Job Description:
+{job_description}
+
+Current Projects:
+{projects}
+
+CRITICAL - PERFECT MATCH WITH JOB:
+1. The projects section must meet ALL key requirements of the job (technologies, outcomes) using the EXACT keywords from the job - but do NOT downgrade the candidate's level.
+2. If the job is junior or mid-level, do NOT make projects sound junior. Present the profile as professionally as possible: keep scope, ownership, and impact (e.g. led, architected, delivered). Do not reduce the level of responsibility to match the job.
+3. For EACH project, write description and bullets that demonstrate what the job asks for with exact keywords - without toning down the candidate's role or impact.
+4. Make descriptions and bullets concise but impactful with metrics; each bullet 1 sentence. Use 3-4 bullets per project. Keep all information truthful.
+5. Use the EXACT project title from "Current Projects" - DO NOT change it.
+
+Return results as a JSON object with "projects" key containing an array:
+   {{
+     "projects": [
+       {{
+         "title": "EXACT project title from above",
+         "description": "enhanced description matching job requirements",
+         "bullets": ["detailed bullet 1 with metrics", "detailed bullet 2", "detailed bullet 3"]
+       }}
+     ]
+   }}
+
+Return ONLY the JSON object with "projects" key, no additional text."""
+
+_SKILLS_PROMPT_TEMPLATE = """You are an expert resume writer specializing in ATS and AI screening. Your task is to make the resume SKILLS SECTION perfectly match the job's tech stack so the profile is detected as a strong match.
+
+Current Skills (candidate's existing skills):
+{skills}
+
+Job Description:
+{job_description}
+
+CRITICAL INSTRUCTIONS - STACK MUST MATCH JOB:
+1. EXTRACT every technology, framework, tool, and platform mentioned in the job and reflect them in the skills section. USE THE EXACT SAME NAMES as in the job.
+2. PRIORITIZE job-mentioned skills first in each category, then include ALL other relevant skills from the candidate's list. Do NOT remove or downgrade the candidate's skills to match a junior job - present the full professional skill set (e.g. if the candidate has architecture, leadership, or advanced tools, keep them). Match the job's stack but keep the profile as strong and professional as possible.
+3. ADD missing job-required technologies when the candidate has related experience (use the exact job term). Create categories that align with the job.
+4. Return results as JSON with category names as keys and arrays of skill strings as values.
+
+Return ONLY the JSON object, no additional text."""
+
+
+# Single-request variant used by customize_all(): one prompt covering every requested section
+_BATCH_SYSTEM_MSG = clean_text(
+    "You are an expert resume writer. Match the job's requirements and keywords; never downgrade the candidate's level (e.g. keep senior/lead language even for junior roles). Present the profile as professionally as possible. Always return valid JSON."
+)
+
+_BATCH_PROMPT_TEMPLATE = """You are an expert resume writer. The resume must PERFECTLY match the job description. Your task is to rewrite the resume sections below so they meet ALL requirements of the job description.
+
+Job Description:
+{job_description}
+{sections}
+CRITICAL - PERFECT MATCH WITH JOB:
+1. Every section must meet ALL key requirements of the job (technologies, skills, responsibilities) using the EXACT keywords from the job - but do NOT downgrade the candidate's level.
+2. If the job is junior or mid-level, do NOT make the resume sound junior. Always present the profile as professionally as possible: keep leadership, scope, ownership, and seniority.
+3. Keep all information truthful - only rephrase and expand existing experience; do not invent new experience. Return plain text only inside strings (no HTML tags).
+
+Return ONLY one JSON object with exactly these keys: {keys}. No additional text."""
+
+_BATCH_SECTION_TEMPLATES = {
+    'summary': """
+SECTION "summary" (a string):
+Current Summary:
+{summary}
+- Rewrite as 3-4 sentences (80-120 words) using the EXACT terminology from the job.
+- Preserve the experience years exactly as "{experience_years}" if it appears in the original summary.
+""",
+    'experiences': """
+SECTION "experiences" (an array of {{"position": "...", "company": "...", "bullets": ["..."]}}):
+Current Experiences:
+{experiences}
+- For EACH experience, write 3-4 concise bullets (1 sentence each, with metrics) that prove the candidate has what the job asks for.
+- ABSOLUTELY CRITICAL: Use the EXACT position name and company name from "Current Experiences" - DO NOT change them.
+""",
+    'projects': """
+SECTION "projects" (an array of {{"title": "...", "description": "...", "bullets": ["..."]}}):
+Current Projects:
+{projects}
+- For EACH project, write a description and 3-4 concise bullets (1 sentence each, with metrics) that demonstrate what the job asks for.
+- Use the EXACT project title from "Current Projects" - DO NOT change it. Keep the same order.
+""",
+    'skills': """
+SECTION "skills" (an object mapping category names to arrays of skill strings):
+Current Skills (candidate's existing skills):
+{skills}
+- EXTRACT every technology, framework, tool, and platform mentioned in the job and use THE EXACT SAME NAMES as in the job.
+- PRIORITIZE job-mentioned skills first in each category, then include ALL other relevant skills from the candidate's list. Do NOT remove the candidate's skills.
+- ADD missing job-required technologies when the candidate has related experience. Create categories that align with the job.
+""",
+}
+
+# max_tokens per section in the single-request call (same budgets as the per-section calls)
+_BATCH_SECTION_MAX_TOKENS = {'summary': 250, 'experiences': 2500, 'projects': 2000, 'skills': 2000}
+
+# Output-token ceilings for models that cannot take the summed budget
+_MODEL_MAX_OUTPUT_TOKENS = {'gpt-4': 4096, 'gpt-3.5-turbo': 4096}
+
+
+class _CompletedItems:
+    """on_partial callback for _llm_cached_call that hands each finished list entry to on_item once.
+    
+    The last entry of a partially parsed reply may still be streaming, so only the ones before
+    it are passed on; finish() passes whatever is left once the full reply has been parsed.
+    """
+
+    def __init__(self, extract: Callable[[Any], Any], on_item: Optional[Callable[[Any], None]]):
+        self.extract = extract
+        self.on_item = on_item
+        self.emitted = 0
+
+    def __call__(self, partial: Any):
+        items = self.extract(partial)
+        if isinstance(items, list):
+            self._emit(items[:-1])
+
+    def finish(self, result: Any) -> Any:
+        items = self.extract(result)
+        if isinstance(items, list):
+            self._emit(items)
+        return result
+
+    def _emit(self, items: list):
+        if self.on_item is not None:
+            for item in items[self.emitted:]:
+                # Progress reporting only: a failing callback must never abort the API call
+                try:
+                    self.on_item(item)
+                except Exception as e:
+                    _log.debug("_CompletedItems: on_item failed: %s", e)
+        self.emitted = max(self.emitted, len(items))
+
+
 class ResumeCustomizer:
     """Customizes resume content based on job descriptions using OpenAI."""
     
-    def __init__(self, pdf_path: str, api_key: Optional[str] = None):
+    def __init__(self, pdf_path: str, api_key: Optional[str] = None, client: Any = None):
         self.updater = PDFResumeUpdater(pdf_path)
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
@@ -255,41 +604,45 @@ class ResumeCustomizer:
                 "OpenAI API key required. Set OPENAI_API_KEY environment variable "
                 "or pass --api-key argument"
             )
-        # CRITICAL: Clean API key to ensure no emojis
-        # Make sure we have a clean copy - don't modify the original
-        original_api_key = self.api_key
-        clean_api_key = clean_text(original_api_key) if original_api_key else None
-        if not clean_api_key:
-            raise ValueError("API key is empty after cleaning")
-        
-        # CRITICAL: Verify API key is clean and separate from any other strings
-        # Ensure it's exactly 164 characters (the expected length)
-        if len(clean_api_key) != 164:
-            # Log detailed error information
-            error_msg = f"API key length is {len(clean_api_key)}, expected 164. Possible corruption."
-            error_msg += f" Original length: {len(original_api_key) if original_api_key else 0}."
-            if len(clean_api_key) > 200:
-                error_msg += f" First 100 chars: {repr(clean_api_key[:100])}"
-                error_msg += f" Last 100 chars: {repr(clean_api_key[-100])}"
-            raise ValueError(error_msg)
-        
-        # Store the cleaned API key
-        self.api_key = clean_api_key
-        
-        # CRITICAL: Initialize OpenAI client with a fresh, clean API key string
-        # Make sure we're passing a clean string, not a reference that could be modified
-        # Use string slicing to ensure we have a completely independent copy
-        api_key_for_client = clean_api_key[:]  # Create a copy
-        self.client = OpenAI(api_key=api_key_for_client)
-        self.resume_data = None
+        # The key goes into an HTTP header: surrounding whitespace (e.g. a trailing newline from
+        # a .env file) is dropped, anything else outside printable ASCII means it is corrupted
+        self.api_key = self.api_key.strip()
+        if not self.api_key:
+            raise ValueError("API key is empty")
+        if not (self.api_key.isascii() and self.api_key.isprintable()) or ' ' in self.api_key:
+            raise ValueError(
+                f"API key contains invalid characters (length {len(self.api_key)}). "
+                "Make sure only the key itself was copied."
+            )
+        
+        if client is None:
+            # Import the OpenAI SDK lazily: it is slow to import and only needed once a customizer exists
+            try:
+                from openai import OpenAI
+            except ImportError:
+                raise ImportError("openai package not installed. Install with: pip install openai")
+            
+            client = OpenAI(api_key=self.api_key)
+        # An existing client (e.g. from batch_customize) is shared: it is thread-safe and pools connections
+        self.client = client
+        # Cached extract_resume_content() result; reset whenever resume_data changes
+        self._resume_content: Optional[Dict[str, Any]] = None
+    
+    @property
+    def resume_data(self) -> Optional[Dict[str, Any]]:
+        """The resume dict being customized; owned by the updater, so both always see the same object."""
+        return self.updater.data
+    
+    @resume_data.setter
+    def resume_data(self, data: Optional[Dict[str, Any]]):
+        self.updater.data = data
+        self._resume_content = None
         
     def load_resume_data(self):
         """Load and extract resume data."""
         if not self.resume_data:
             self.updater.extract_json_data()
-            self.resume_data = self.updater.data
-        else:
-            self.updater.data = self.resume_data
+            self._resume_content = None
         
         # Log all sections for recognition
         self.log_all_sections()
@@ -346,34 +699,43 @@ class ResumeCustomizer:
         """Strip leading list markers / stray chars so titles render correctly in PDF."""
         if not raw or not isinstance(raw, str):
             return raw or ""
-        s = raw.strip()
-        s = re.sub(r'^\s*\d+\.\s*', '', s)
-        s = re.sub(r'^[•\-–—]\s*', '', s)
-        if len(s) > 2 and s[1] in (' ', '\t') and (
-            s[0] in ('n', 'N') or (len(s) > 2 and s[2:3] and s[2].isupper())
-        ):
+        s = _PROJECT_TITLE_PREFIX_RE.sub('', raw.strip(), count=1)
+        if len(s) > 2 and s[1] in ' \t' and (s[0] in 'nN' or s[2].isupper()):
             s = s[2:].lstrip()
         return s.strip()
     
     def extract_resume_content(self) -> Dict[str, Any]:
-        """Extract key content from resume for customization."""
+        """Extract key content from resume for customization.
+        
+        The result is cached until resume_data is reloaded or updated, since every
+        customize_* call needs the same content.
+        """
+        if self._resume_content is not None:
+            return self._resume_content
+        
         self.load_resume_data()
         
         header = self.resume_data.get('header', {})
         
-        # Extract summary (find section by content: items with 'text')
         summary = ""
+        experiences = []
+        skills = []
+        education = []
+        found_summary = found_experience = found_skills = found_education = False
+        
+        # Single pass over sections; each category takes the FIRST section that matches it.
+        # The content predicates overlap (a skills section also looks like experience),
+        # so every category is checked independently rather than with elif.
         for section in self.resume_data.get('sections', []):
-            if self._section_has_summary_items(section):
+            # Summary (find section by content: items with 'text')
+            if not found_summary and self._section_has_summary_items(section):
+                found_summary = True
                 if section.get('items'):
                     summary = section['items'][0].get('text', '')
-                break
-        summary = clean_text(summary)
-        
-        # Extract experiences (find section by content: items with position/workplace or title/company)
-        experiences = []
-        for section in self.resume_data.get('sections', []):
-            if self._section_has_experience_items(section):
+            
+            # Experiences (find section by content: items with position/workplace or title/company)
+            if not found_experience and self._section_has_experience_items(section):
+                found_experience = True
                 for item in section.get('items', []):
                     pos = item.get('position', '') or item.get('title', '')
                     comp = item.get('workplace', '') or item.get('company', '')
@@ -382,23 +744,19 @@ class ResumeCustomizer:
                         'company': clean_text(comp),
                         'location': clean_text(item.get('location', '')),
                         'dateRange': item.get('dateRange', {}),
-                        'bullets': [clean_text(bullet) for bullet in item.get('bullets', [])]
+                        'bullets': clean_text_batch(item.get('bullets', []))
                     }
                     experiences.append(exp)
-                break
-        
-        # Extract skills (find section by content: items with 'tags')
-        skills = []
-        for section in self.resume_data.get('sections', []):
-            if self._section_has_skill_items(section):
+            
+            # Skills (find section by content: items with 'tags')
+            if not found_skills and self._section_has_skill_items(section):
+                found_skills = True
                 for item in section.get('items', []):
-                    skills.extend([clean_text(tag) for tag in item.get('tags', [])])
-                break
-        
-        # Extract education (use __t for education; schema is stable)
-        education = []
-        for section in self.resume_data.get('sections', []):
-            if section.get('__t') == 'EducationSection':
+                    skills.extend(clean_text_batch(item.get('tags', [])))
+            
+            # Education (use __t for education; schema is stable)
+            if not found_education and section.get('__t') == 'EducationSection':
+                found_education = True
                 for item in section.get('items', []):
                     edu = {
                         'institution': clean_text(item.get('institution', '')),
@@ -407,16 +765,86 @@ class ResumeCustomizer:
                         'dateRange': item.get('dateRange', {})
                     }
                     education.append(edu)
+            
+            if found_summary and found_experience and found_skills and found_education:
                 break
         
-        return {
+        summary = clean_text(summary)
+        
+        self._resume_content = {
             'name': clean_text(header.get('name', '')),
             'title': clean_text(header.get('title', '')),
             'summary': summary,
             'experiences': experiences,
-            'skills': list(set(skills)),
+            'skills': list(dict.fromkeys(skills)),
             'education': education
         }
+        return self._resume_content
+    
+    def _llm_cached_call(self, messages: List[Dict[str, str]], model: str, temperature: float,
+                         response_format: Optional[Dict[str, Any]] = None, max_tokens: Optional[int] = None,
+                         on_partial: Optional[Callable[[Any], None]] = None) -> str:
+        """Run one chat completion and return the reply text.
+        
+        With NOVA_LLM_CACHE=1 the reply is stored under _LLM_CACHE_DIR and identical requests
+        (same messages, model and parameters) are answered from disk without calling the API.
+        If on_partial is given and jiter is available, the reply is streamed and on_partial
+        receives the partially parsed JSON each time a chunk closes an array or object.
+        """
+        kwargs = {'model': model, 'messages': messages, 'temperature': temperature}
+        if response_format is not None:
+            kwargs['response_format'] = response_format
+        if max_tokens is not None:
+            kwargs['max_tokens'] = max_tokens
+        
+        cache_path = None
+        if os.environ.get('NOVA_LLM_CACHE') == '1':
+            import hashlib
+            key = json.dumps(kwargs, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+            cache_path = _LLM_CACHE_DIR / f"{hashlib.blake2b(key.encode('utf-8'), digest_size=20).hexdigest()}.json"
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)['content']
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        
+        if on_partial is not None and jiter is not None:
+            buf = bytearray()
+            for chunk in self.client.chat.completions.create(stream=True, **kwargs):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                buf += delta.encode('utf-8')
+                # Only a closing bracket can complete an item, so skip the re-parse otherwise
+                if ']' in delta or '}' in delta:
+                    try:
+                        partial = jiter.from_json(bytes(buf), partial_mode='trailing-strings')
+                    except ValueError:
+                        continue
+                    on_partial(partial)
+            content = buf.decode('utf-8')
+        else:
+            response = self.client.chat.completions.create(**kwargs)
+            content = response.choices[0].message.content
+        
+        if cache_path is not None and isinstance(content, str):
+            if response_format is not None:
+                # Never cache a malformed JSON reply; a retry should hit the API again
+                try:
+                    _loads_model_json(content)
+                except json.JSONDecodeError:
+                    return content
+            # Write to a temp file and rename, so concurrent calls never read a partial entry
+            try:
+                import tempfile
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'content': content}, f, ensure_ascii=False)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+        return content
     
     def customize_summary(self, job_description: str, model: str = "gpt-4o-mini") -> str:
         """Customize summary section based on job description."""
@@ -425,136 +853,68 @@ class ResumeCustomizer:
         
         # Extract experience years from original summary
         original_summary = resume_content['summary']
-        experience_years_match = re.search(
-            r'(\d+\+?|\d+\s*years?|over\s+\d+\s*years?|\d+\+\s*years?)', 
-            original_summary, re.IGNORECASE
-        )
+        experience_years_match = _EXPERIENCE_YEARS_RE.search(original_summary)
         experience_years = experience_years_match.group(0) if experience_years_match else None
         
-        # CRITICAL: Clean all content before building the prompt string
-        # This prevents emojis from being in the f-string which could cause encoding errors
-        clean_summary = clean_text(resume_content['summary'])
-        clean_job_desc = clean_text(job_description)
-        
-        prompt = f"""You are an expert resume writer. The resume must PERFECTLY match the job description. Your task is to rewrite the summary so it meets ALL requirements of the job description.
-
-Current Summary:
-{clean_summary}
-
-Job Description:
-{clean_job_desc}
-
-CRITICAL - PERFECT MATCH WITH JOB:
-1. The summary must meet ALL key requirements of the job (technologies, skills, responsibilities) using the EXACT same wording as the job - but do NOT downgrade the candidate's level.
-2. If the job is junior or mid-level, do NOT make the summary sound junior. Always present the profile as professionally as possible: preserve the candidate's actual seniority, leadership, and scope. A senior candidate applying to a junior role should still sound senior and professional.
-3. Extract requirements from the job (technologies, methodologies, role type) and address them with exact keywords - never reduce or tone down the candidate's experience level to match the job level.
-4. Use the EXACT terminology from the job (e.g. ".NET Core", "Azure", "microservices"). Keep the summary concise - 3-4 sentences (80-120 words).
-5. Preserve the experience years exactly as "{experience_years}" if it appears in the original summary.
-6. Keep all information truthful - only rephrase existing experience; do not invent new experience. Remove ALL HTML tags - return plain text only.
-
-Return ONLY the customized summary text, no explanations or additional text."""
+        # job_description was cleaned on entry and extract_resume_content returns cleaned text
+        prompt = _SUMMARY_PROMPT_TEMPLATE.format(
+            summary=original_summary, job_description=job_description, experience_years=experience_years
+        )
 
-        prompt = clean_text(prompt)
-        system_message = clean_text("You are an expert resume writer. Match the job's requirements and keywords, but never downgrade the candidate's level (e.g. if the job is junior, keep the profile senior and professional). Always present the profile as professionally as possible.")
-        
         messages = [
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": _SUMMARY_SYSTEM_MSG},
             {"role": "user", "content": prompt}
         ]
         
-        # CRITICAL: Final cleaning pass - ensure NO emojis in messages before API call
-        for msg in messages:
-            msg['content'] = clean_text(msg['content'])
-        
-        clean_model = clean_text(model)
-        
-        response = self.client.chat.completions.create(
-            model=clean_model,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=250
-        )
+        content = self._llm_cached_call(messages, model, temperature=0.7, max_tokens=250)
         
-        summary = clean_text(response.choices[0].message.content.strip())
-        
-        # Restore experience years if missing
+        summary = clean_text(content.strip())
+        return self._restore_experience_years(summary, experience_years)
+    
+    @staticmethod
+    def _restore_experience_years(summary: str, experience_years: Optional[str]) -> str:
+        """Put the original experience years back if the rewritten summary dropped them."""
         if experience_years:
-            if not re.search(r'(\d+\+?|\d+\s*years?|over\s+\d+\s*years?|\d+\+\s*years?)', summary, re.IGNORECASE):
+            if not _EXPERIENCE_YEARS_RE.search(summary):
                 summary = f"With {experience_years} of experience, {summary.lower()}"
-        
         return summary
     
+    @staticmethod
+    def _format_experiences_for_prompt(experiences: List[Dict[str, Any]]) -> str:
+        """Format extracted experiences as the numbered list used in prompts."""
+        parts = []
+        for i, exp in enumerate(experiences, 1):
+            parts.append(f"\n{i}. {exp['position']} at {exp['company']}\n   Current bullets:\n")
+            parts.extend(f"   - {bullet}\n" for bullet in exp['bullets'])
+        return ''.join(parts)
+    
     def customize_experience_bullets(self, job_description: str, model: str = "gpt-4o-mini") -> List[Dict[str, Any]]:
         """Customize experience bullet points to match job description."""
         job_description = clean_text(job_description)
         resume_content = self.extract_resume_content()
         
         # Format experiences for prompt
-        exp_text = ""
-        for i, exp in enumerate(resume_content['experiences'], 1):
-            exp_text += f"\n{i}. {exp['position']} at {exp['company']}\n"
-            exp_text += f"   Current bullets:\n"
-            for bullet in exp['bullets']:
-                exp_text += f"   - {bullet}\n"
+        exp_text = self._format_experiences_for_prompt(resume_content['experiences'])
         
         # CRITICAL: Clean all content before building the prompt string
-        clean_job_desc = clean_text(job_description)
         clean_exp_text = clean_text(exp_text)
         
-        prompt = f"""You are an expert resume writer. The resume must PERFECTLY match the job description. Your task is to rewrite experience bullets so they meet ALL requirements of the job description.
-
-Job Description:
-{clean_job_desc}
-
-Current Experiences:
-{clean_exp_text}
-
-CRITICAL - PERFECT MATCH WITH JOB:
-1. The experience section must meet ALL key requirements of the job (technologies, responsibilities, qualifications) using the EXACT keywords from the job - but do NOT downgrade the candidate's level.
-2. If the job is junior or mid-level, do NOT make the experience sound junior. Always present the profile as professionally as possible: keep leadership, scope, ownership, and seniority. A senior candidate's bullets should still show senior/lead-level impact (e.g. led, architected, mentored) even when applying to a junior role.
-3. For EACH experience, write bullets that prove the candidate has what the job asks for - use EXACT keywords and phrases from the job. Do not tone down achievements or reduce responsibility level to match the job.
-4. Make bullets concise but impactful with metrics; each bullet 1 sentence. Use 3-4 bullets per experience. Keep all information truthful - only expand and rephrase existing achievements.
-5. ABSOLUTELY CRITICAL: Use the EXACT position name and company name from "Current Experiences" - DO NOT change them. Return them EXACTLY as in the input.
-
-Return results as a JSON object with "experiences" key containing an array:
-   {{
-     "experiences": [
-       {{
-         "position": "EXACT position name from above",
-         "company": "EXACT company name from above",
-         "bullets": ["detailed bullet 1 with metrics and job-relevant keywords", "detailed bullet 2", "detailed bullet 3", "detailed bullet 4", "detailed bullet 5"]
-       }}
-     ]
-   }}
-
-Return ONLY the JSON object with "experiences" key, no additional text."""
+        prompt = _EXPERIENCE_PROMPT_TEMPLATE.format(
+            job_description=job_description, experiences=clean_exp_text
+        )
 
-        prompt = clean_text(prompt)
-        system_message = clean_text("You are an expert resume writer. Match the job's requirements and keywords; never downgrade the candidate's level (e.g. keep senior/lead language even for junior roles). Always return valid JSON.")
-        
         messages = [
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": _EXPERIENCE_SYSTEM_MSG},
             {"role": "user", "content": prompt}
         ]
         
-        # CRITICAL: Final cleaning pass - ensure NO emojis in messages before API call
-        for msg in messages:
-            msg['content'] = clean_text(msg['content'])
-        
-        clean_model = clean_text(model)
-        
-        response = self.client.chat.completions.create(
-            model=clean_model,
-            messages=messages,
-            temperature=0.7,
-            response_format={"type": "json_object"},
-            max_tokens=2500
+        reply = self._llm_cached_call(
+            messages, model, temperature=0.7, response_format={"type": "json_object"}, max_tokens=2500
         )
         
         try:
-            content = response.choices[0].message.content
-            content = clean_text(content)
-            result = json.loads(content)
+            content = clean_text(reply)
+            result = _loads_model_json(content)
             
             if isinstance(result, dict) and 'experiences' in result:
                 return result['experiences']
@@ -566,13 +926,15 @@ Return ONLY the JSON object with "experiences" key, no additional text."""
                         return value
                 return []
         except json.JSONDecodeError:
-            content = clean_text(response.choices[0].message.content.strip())
-            if content.startswith('['):
-                return json.loads(content)
-            raise ValueError(f"Failed to parse experience customization: {content[:200]}")
+            raise ValueError(f"Failed to parse experience customization: {clean_text(reply)[:200]}")
     
-    def customize_projects(self, job_description: str, model: str = "gpt-4o-mini") -> List[Dict[str, Any]]:
-        """Customize project descriptions to match job description."""
+    def customize_projects(self, job_description: str, model: str = "gpt-4o-mini",
+                           on_project: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """Customize project descriptions to match job description.
+        
+        on_project, if given, is called with each customized project as soon as it has
+        streamed in, and for any remaining ones once the reply is complete.
+        """
         _ensure_debug_log()
         _log.debug("customize_projects: start")
         job_description = clean_text(job_description)
@@ -582,183 +944,136 @@ Return ONLY the JSON object with "experiences" key, no additional text."""
         num_sections = len(self.resume_data.get('sections', []))
         _log.debug("customize_projects: resume_data has %s sections", num_sections)
 
-        # Extract projects from resume (use project NAME for title so API returns consistent titles)
-        projects = []
-        project_section_found = False
-        for si, section in enumerate(self.resume_data.get('sections', [])):
-            if self._section_has_project_items(section):
-                project_section_found = True
-                items = section.get('items', [])
-                _log.debug("customize_projects: project section found at section index %s, items=%s", si, len(items))
-                if not items:
-                    break
-                for item in items:
-                    # Prefer project name (projectName/name) over role (title) for stable matching
-                    project_name = clean_text(
-                        item.get('projectName', '') or item.get('name', '') or item.get('title', '')
-                    )
-                    description = clean_text(item.get('description', '') or item.get('text', ''))
-                    bullets = [clean_text(bullet) for bullet in item.get('bullets', [])]
-                    proj = {'title': project_name, 'description': description, 'bullets': bullets}
-                    if proj['title']:
-                        projects.append(proj)
-                        _log.debug("customize_projects: extracted project title=%r (desc len=%s, bullets=%s)",
-                                   proj['title'][:60], len(description), len(bullets))
-                break
-
-        if not project_section_found:
-            _log.debug("customize_projects: no project section found ( _section_has_project_items False for all)")
+        projects = self._extract_projects()
         if not projects:
-            _log.debug("customize_projects: no projects extracted, returning []")
-        if not project_section_found or not projects:
             return []
 
         # Format projects for prompt
-        proj_text = ""
-        for i, proj in enumerate(projects, 1):
-            proj_text += f"\n{i}. {proj['title']}\n"
-            if proj['description']:
-                proj_text += f"   Description: {proj['description']}\n"
-            if proj['bullets']:
-                proj_text += f"   Current bullets:\n"
-                for bullet in proj['bullets']:
-                    proj_text += f"   - {bullet}\n"
+        proj_text = self._format_projects_for_prompt(projects)
         
-        clean_job_desc = clean_text(job_description)
         clean_proj_text = clean_text(proj_text)
         
-        prompt = f"""You are an expert resume writer. The resume must PERFECTLY match the job description. Your task is to rewrite project descriptions and bullets so they meet ALL requirements of the job description.
-
-Job Description:
-{clean_job_desc}
-
-Current Projects:
-{clean_proj_text}
-
-CRITICAL - PERFECT MATCH WITH JOB:
-1. The projects section must meet ALL key requirements of the job (technologies, outcomes) using the EXACT keywords from the job - but do NOT downgrade the candidate's level.
-2. If the job is junior or mid-level, do NOT make projects sound junior. Present the profile as professionally as possible: keep scope, ownership, and impact (e.g. led, architected, delivered). Do not reduce the level of responsibility to match the job.
-3. For EACH project, write description and bullets that demonstrate what the job asks for with exact keywords - without toning down the candidate's role or impact.
-4. Make descriptions and bullets concise but impactful with metrics; each bullet 1 sentence. Use 3-4 bullets per project. Keep all information truthful.
-5. Use the EXACT project title from "Current Projects" - DO NOT change it.
-
-Return results as a JSON object with "projects" key containing an array:
-   {{
-     "projects": [
-       {{
-         "title": "EXACT project title from above",
-         "description": "enhanced description matching job requirements",
-         "bullets": ["detailed bullet 1 with metrics", "detailed bullet 2", "detailed bullet 3"]
-       }}
-     ]
-   }}
-
-Return ONLY the JSON object with "projects" key, no additional text."""
+        prompt = _PROJECTS_PROMPT_TEMPLATE.format(
+            job_description=job_description, projects=clean_proj_text
+        )
 
-        prompt = clean_text(prompt)
-        system_message = clean_text("You are an expert resume writer. Match the job's requirements and keywords; never downgrade the candidate's level. Present the profile as professionally as possible. Always return valid JSON.")
-        
         messages = [
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": _PROJECTS_SYSTEM_MSG},
             {"role": "user", "content": prompt}
         ]
         
-        for msg in messages:
-            msg['content'] = clean_text(msg['content'])
-        
-        clean_model = clean_text(model)
-        
-        response = self.client.chat.completions.create(
-            model=clean_model,
-            messages=messages,
-            temperature=0.7,
-            response_format={"type": "json_object"},
-            max_tokens=2000
+        completed = _CompletedItems(lambda r: r.get('projects') if isinstance(r, dict) else r, on_project)
+        reply = self._llm_cached_call(
+            messages, model, temperature=0.7, response_format={"type": "json_object"}, max_tokens=2000,
+            on_partial=completed if on_project is not None else None
         )
         
         try:
-            content = response.choices[0].message.content
-            content = clean_text(content)
-            result = json.loads(content)
+            content = clean_text(reply)
+            result = _loads_model_json(content)
             if isinstance(result, dict) and 'projects' in result:
                 out = result['projects']
                 _log.debug("customize_projects: API returned %s projects", len(out))
                 for i, p in enumerate(out):
                     _log.debug("customize_projects: API project[%s] title=%r", i, (p.get('title') or '')[:60])
-                return out
+                return completed.finish(out)
             elif isinstance(result, list):
                 _log.debug("customize_projects: API returned list of %s items", len(result))
-                return result
+                return completed.finish(result)
             else:
                 for value in result.values():
                     if isinstance(value, list):
                         _log.debug("customize_projects: API returned dict with list value len=%s", len(value))
-                        return value
+                        return completed.finish(value)
                 _log.debug("customize_projects: API response format unexpected, keys=%s", list(result.keys()) if isinstance(result, dict) else type(result))
                 return []
         except json.JSONDecodeError as e:
-            raw = response.choices[0].message.content
-            content = clean_text(raw.strip())[:300]
+            content = clean_text(reply)[:300]
             _log.debug("customize_projects: JSONDecodeError %s; content preview=%r", e, content)
-            if content.startswith('['):
-                return json.loads(content)
             raise ValueError(f"Failed to parse project customization: {content[:200]}")
         except Exception as e:
             _log.debug("customize_projects: exception %s", e, exc_info=True)
             raise
     
-    def prioritize_skills(self, job_description: str, model: str = "gpt-4o-mini") -> Dict[str, List[str]]:
-        """Prioritize and reorganize skills based on job description."""
+    def _extract_projects(self) -> List[Dict[str, Any]]:
+        """Extract projects (title, description, bullets) from the first project-like section."""
+        # Extract projects from resume (use project NAME for title so API returns consistent titles)
+        projects = []
+        project_section_found = False
+        for si, section in enumerate(self.resume_data.get('sections', [])):
+            if self._section_has_project_items(section):
+                project_section_found = True
+                items = section.get('items', [])
+                _log.debug("customize_projects: project section found at section index %s, items=%s", si, len(items))
+                if not items:
+                    break
+                for item in items:
+                    # Prefer project name (projectName/name) over role (title) for stable matching
+                    project_name = clean_text(
+                        item.get('projectName', '') or item.get('name', '') or item.get('title', '')
+                    )
+                    description = clean_text(item.get('description', '') or item.get('text', ''))
+                    bullets = [clean_text(bullet) for bullet in item.get('bullets', [])]
+                    proj = {'title': project_name, 'description': description, 'bullets': bullets}
+                    if proj['title']:
+                        projects.append(proj)
+                        _log.debug("customize_projects: extracted project title=%r (desc len=%s, bullets=%s)",
+                                   proj['title'][:60], len(description), len(bullets))
+                break
+
+        if not project_section_found:
+            _log.debug("customize_projects: no project section found ( _section_has_project_items False for all)")
+        if not projects:
+            _log.debug("customize_projects: no projects extracted, returning []")
+        return projects
+    
+    @staticmethod
+    def _format_projects_for_prompt(projects: List[Dict[str, Any]]) -> str:
+        """Format extracted projects as the numbered list used in prompts."""
+        parts = []
+        for i, proj in enumerate(projects, 1):
+            parts.append(f"\n{i}. {proj['title']}\n")
+            if proj['description']:
+                parts.append(f"   Description: {proj['description']}\n")
+            if proj['bullets']:
+                parts.append("   Current bullets:\n")
+                parts.extend(f"   - {bullet}\n" for bullet in proj['bullets'])
+        return ''.join(parts)
+    
+    def prioritize_skills(self, job_description: str, model: str = "gpt-4o-mini",
+                          on_category: Optional[Callable[[str, List[str]], None]] = None) -> Dict[str, List[str]]:
+        """Prioritize and reorganize skills based on job description.
+        
+        on_category, if given, is called with (category, skills) for each category as soon as
+        it has streamed in, and for any remaining ones once the reply is complete.
+        """
         job_description = clean_text(job_description)
         resume_content = self.extract_resume_content()
         
-        # CRITICAL: Clean all content before building the prompt string
-        clean_skills = ', '.join([clean_text(skill) for skill in resume_content['skills']])
-        clean_job_desc = clean_text(job_description)
-        
-        prompt = f"""You are an expert resume writer specializing in ATS and AI screening. Your task is to make the resume SKILLS SECTION perfectly match the job's tech stack so the profile is detected as a strong match.
-
-Current Skills (candidate's existing skills):
-{clean_skills}
-
-Job Description:
-{clean_job_desc}
-
-CRITICAL INSTRUCTIONS - STACK MUST MATCH JOB:
-1. EXTRACT every technology, framework, tool, and platform mentioned in the job and reflect them in the skills section. USE THE EXACT SAME NAMES as in the job.
-2. PRIORITIZE job-mentioned skills first in each category, then include ALL other relevant skills from the candidate's list. Do NOT remove or downgrade the candidate's skills to match a junior job - present the full professional skill set (e.g. if the candidate has architecture, leadership, or advanced tools, keep them). Match the job's stack but keep the profile as strong and professional as possible.
-3. ADD missing job-required technologies when the candidate has related experience (use the exact job term). Create categories that align with the job.
-4. Return results as JSON with category names as keys and arrays of skill strings as values.
-
-Return ONLY the JSON object, no additional text."""
+        # Skills are cleaned by extract_resume_content, job_description on entry
+        prompt = _SKILLS_PROMPT_TEMPLATE.format(
+            skills=', '.join(resume_content['skills']), job_description=job_description
+        )
 
-        prompt = clean_text(prompt)
-        system_message = clean_text("You are an expert resume writer. Always return valid JSON. The skills section must match the job's tech stack exactly so ATS and AI detect the resume as a strong match.")
-        
         messages = [
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": _SKILLS_SYSTEM_MSG},
             {"role": "user", "content": prompt}
         ]
         
-        # CRITICAL: Final cleaning pass - ensure NO emojis in messages before API call
-        for msg in messages:
-            msg['content'] = clean_text(msg['content'])
-        
-        clean_model = clean_text(model)
-        
-        response = self.client.chat.completions.create(
-            model=clean_model,
-            messages=messages,
-            temperature=0.5,
-            response_format={"type": "json_object"},
-            max_tokens=2000
+        completed = _CompletedItems(
+            lambda r: list(r.items()) if isinstance(r, dict) else None,
+            (lambda item: on_category(*item)) if on_category is not None else None
+        )
+        reply = self._llm_cached_call(
+            messages, model, temperature=0.5, response_format={"type": "json_object"}, max_tokens=2000,
+            on_partial=completed if on_category is not None else None
         )
         
         try:
-            content = clean_text(response.choices[0].message.content)
-            return json.loads(content)
+            content = clean_text(reply)
+            return completed.finish(_loads_model_json(content))
         except json.JSONDecodeError:
-            error_content = clean_text(response.choices[0].message.content)[:200]
+            error_content = clean_text(reply)[:200]
             raise ValueError(f"Failed to parse skills prioritization: {error_content}")
     
     def customize_for_job(self, job_description: str, 
@@ -766,78 +1081,357 @@ Return ONLY the JSON object, no additional text."""
                           customize_experience: bool = True,
                           customize_skills: bool = True,
                           customize_projects: bool = True,
-                          model: str = "gpt-4o-mini") -> Dict[str, Any]:
-        """Customize entire resume for a job description."""
+                          model: str = "gpt-4o-mini",
+                          single_request: bool = False,
+                          progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Customize entire resume for a job description.
+        
+        The per-section OpenAI calls are independent, so they run concurrently
+        and total latency is that of the slowest call instead of the sum.
+        With single_request=True all sections are requested in one call instead
+        (see customize_all).
+        progress, if given, receives a short message for each project and skill
+        category as it streams in (called from worker threads).
+        """
+        if single_request:
+            return self.customize_all(
+                job_description,
+                customize_summary=customize_summary,
+                customize_experience=customize_experience,
+                customize_skills=customize_skills,
+                customize_projects=customize_projects,
+                model=model
+            )
+        
         job_description = clean_text(job_description)
         
-        updates = {}
+        # Load and extract once up front so the concurrent calls below only read cached data
+        self.extract_resume_content()
+        _ensure_debug_log()
         
+        tasks = self._section_tasks(customize_summary, customize_experience, customize_skills,
+                                    customize_projects, progress)
+        results = {}
+        if tasks:
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                futures = [(key, executor.submit(fn, job_description, model)) for key, fn in tasks]
+                for key, future in futures:
+                    results[key] = future.result()
+        
+        return self._collect_updates(results)
+    
+    def _section_tasks(self, customize_summary: bool, customize_experience: bool,
+                       customize_skills: bool, customize_projects: bool,
+                       progress: Optional[Callable[[str], None]] = None) -> list:
+        """(key, fn) pairs for the requested sections; each fn takes (job_description, model)."""
+        tasks = []
         if customize_summary:
-            updates['summary'] = self.customize_summary(job_description, model)
-        
+            tasks.append(('summary', self.customize_summary))
         if customize_experience:
-            updates['experiences'] = self.customize_experience_bullets(job_description, model)
-        
+            tasks.append(('experiences', self.customize_experience_bullets))
         if customize_projects:
-            _ensure_debug_log()
-            projects = self.customize_projects(job_description, model)
+            on_project = None
+            if progress is not None:
+                # Streamed entries come from the raw reply: skip non-objects and clean titles for display
+                def on_project(project):
+                    if isinstance(project, dict):
+                        progress(f"Project customized: {clean_text(project.get('title', ''))}")
+            tasks.append(('projects', functools.partial(self.customize_projects, on_project=on_project)))
+        if customize_skills:
+            on_category = None
+            if progress is not None:
+                on_category = lambda category, skills: progress(f"Skills prioritized: {clean_text(category)}")
+            tasks.append(('skills', functools.partial(self.prioritize_skills, on_category=on_category)))
+        return tasks
+    
+    @staticmethod
+    def _collect_updates(results: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the updates dict from per-section results keyed like _section_tasks."""
+        updates = {}
+        
+        if 'summary' in results:
+            updates['summary'] = results['summary']
+        
+        if 'experiences' in results:
+            updates['experiences'] = results['experiences']
+        
+        if 'projects' in results:
+            projects = results['projects']
             _log.debug("customize_for_job: customize_projects returned %s items", len(projects) if projects else 0)
             if projects:
                 updates['projects'] = projects
             else:
                 _log.debug("customize_for_job: updates['projects'] NOT set (empty list)")
 
-        if customize_skills:
-            updates['skills'] = self.prioritize_skills(job_description, model)
+        if 'skills' in results:
+            updates['skills'] = results['skills']
         
         return updates
     
+    @classmethod
+    def batch_customize(cls, pdf_paths: List[str], job_description: str,
+                        api_key: Optional[str] = None,
+                        model: str = "gpt-4o-mini",
+                        concurrency: int = 16,
+                        customize_summary: bool = True,
+                        customize_experience: bool = True,
+                        customize_skills: bool = True,
+                        customize_projects: bool = True) -> List[tuple]:
+        """Customize several resumes for the same job description.
+        
+        All resumes share one OpenAI client, and every (resume, section) call goes
+        through a single pool of `concurrency` workers, so throughput is bounded by
+        the pool size (and the API rate limit) rather than by the number of resumes.
+        Returns (customizer, updates) pairs in the order of pdf_paths; pass each
+        updates dict to that customizer's apply_updates.
+        """
+        customizers = []
+        client = None
+        for pdf_path in pdf_paths:
+            customizer = cls(pdf_path, api_key=api_key, client=client)
+            client = customizer.client
+            customizers.append(customizer)
+        if not customizers:
+            return []
+        
+        job_description = clean_text(job_description)
+        _ensure_debug_log()
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            # Parse the PDFs in parallel first so the section calls only read cached data
+            list(executor.map(lambda customizer: customizer.extract_resume_content(), customizers))
+            
+            futures = []
+            for customizer in customizers:
+                tasks = customizer._section_tasks(customize_summary, customize_experience,
+                                                  customize_skills, customize_projects)
+                futures.append([(key, executor.submit(fn, job_description, model)) for key, fn in tasks])
+            
+            return [
+                (customizer, cls._collect_updates({key: future.result() for key, future in resume_futures}))
+                for customizer, resume_futures in zip(customizers, futures)
+            ]
+    
+    def customize_all(self, job_description: str,
+                      customize_summary: bool = True,
+                      customize_experience: bool = True,
+                      customize_skills: bool = True,
+                      customize_projects: bool = True,
+                      model: str = "gpt-4o-mini") -> Dict[str, Any]:
+        """Customize all requested sections with a single JSON-mode OpenAI call.
+        
+        Sends the job description once and saves the per-request overhead of the
+        separate calls. Returns the same updates dict as customize_for_job. If the
+        response is not valid JSON, or a requested section is missing or malformed,
+        those sections are redone with the per-section calls.
+        """
+        _ensure_debug_log()
+        job_description = clean_text(job_description)
+        resume_content = self.extract_resume_content()
+        
+        experience_years = None
+        sections = []
+        if customize_summary:
+            experience_years_match = _EXPERIENCE_YEARS_RE.search(resume_content['summary'])
+            experience_years = experience_years_match.group(0) if experience_years_match else None
+            sections.append(('summary', {
+                'summary': resume_content['summary'], 'experience_years': experience_years
+            }))
+        if customize_experience:
+            sections.append(('experiences', {
+                'experiences': clean_text(self._format_experiences_for_prompt(resume_content['experiences']))
+            }))
+        if customize_projects:
+            projects = self._extract_projects()
+            if projects:
+                sections.append(('projects', {
+                    'projects': clean_text(self._format_projects_for_prompt(projects))
+                }))
+        if customize_skills:
+            sections.append(('skills', {'skills': ', '.join(resume_content['skills'])}))
+        
+        if not sections:
+            return {}
+        
+        keys = [key for key, _ in sections]
+        prompt = _BATCH_PROMPT_TEMPLATE.format(
+            job_description=job_description,
+            sections=''.join(_BATCH_SECTION_TEMPLATES[key].format(**fields) for key, fields in sections),
+            keys=', '.join(f'"{key}"' for key in keys)
+        )
+        max_tokens = sum(_BATCH_SECTION_MAX_TOKENS[key] for key in keys)
+        if model in _MODEL_MAX_OUTPUT_TOKENS:
+            max_tokens = min(max_tokens, _MODEL_MAX_OUTPUT_TOKENS[model])
+        
+        reply = self._llm_cached_call(
+            [
+                {"role": "system", "content": _BATCH_SYSTEM_MSG},
+                {"role": "user", "content": prompt}
+            ],
+            model,
+            temperature=0.7,
+            response_format={"type": "json_object"},
+            max_tokens=max_tokens
+        )
+        
+        try:
+            result = _loads_model_json(clean_text(reply))
+        except json.JSONDecodeError as e:
+            _log.debug("customize_all: JSONDecodeError %s; falling back to per-section calls", e)
+            result = {}
+        if not isinstance(result, dict):
+            result = {}
+        
+        updates = {}
+        retry = set()
+        for key in keys:
+            value = result.get(key)
+            if key == 'summary' and isinstance(value, str) and value.strip():
+                summary = clean_text(value.strip())
+                updates['summary'] = self._restore_experience_years(summary, experience_years)
+            elif key in ('experiences', 'projects') and isinstance(value, list):
+                # Like customize_for_job, an empty project list leaves projects untouched
+                if value or key == 'experiences':
+                    updates[key] = value
+            elif key == 'skills' and isinstance(value, dict):
+                updates['skills'] = value
+            else:
+                retry.add(key)
+        
+        if retry:
+            _log.debug("customize_all: redoing sections %s with per-section calls", sorted(retry))
+            updates.update(self.customize_for_job(
+                job_description,
+                customize_summary='summary' in retry,
+                customize_experience='experiences' in retry,
+                customize_skills='skills' in retry,
+                customize_projects='projects' in retry,
+                model=model
+            ))
+        
+        # Same key order as customize_for_job
+        return {key: updates[key] for key in ('summary', 'experiences', 'projects', 'skills') if key in updates}
+    
+    @staticmethod
+    def _fuzzy_match_experience(norm_original_pos: str, norm_original_comp: str,
+                                norm_customs: list) -> Optional[Dict[str, Any]]:
+        """Best custom experience for a PDF item whose (position, company) key had no exact match."""
+        best_match = None
+        best_score = 0
+        # Word sets without punctuation-only words (like '-', '.', etc.)
+        pos_words_orig = _match_words(norm_original_pos)
+        comp_words_orig = _match_words(norm_original_comp)
+        for custom_pos, custom_comp, pos_words_custom, comp_words_custom, custom_exp in norm_customs:
+            # Calculate match score based on position and company similarity
+            pos_score = 0
+            comp_score = 0
+            
+            # Position matching: check if key words match
+            if pos_words_orig and pos_words_custom:
+                common_pos_words = pos_words_orig.intersection(pos_words_custom)
+                # Calculate score based on common words
+                pos_score = len(common_pos_words) / max(len(pos_words_orig), len(pos_words_custom))
+                # If most key words match, boost the score
+                if len(common_pos_words) >= 3:  # At least 3 common words
+                    pos_score = max(pos_score, 0.6)
+            
+            # Company matching: check if key words match
+            if comp_words_orig and comp_words_custom:
+                common_comp_words = comp_words_orig.intersection(comp_words_custom)
+                comp_score = len(common_comp_words) / max(len(comp_words_orig), len(comp_words_custom))
+                # Company names are usually shorter, so be more lenient
+                if len(common_comp_words) >= 1:  # At least 1 common word
+                    comp_score = max(comp_score, 0.5)
+            
+            # Also try substring matching as fallback
+            if not pos_score and (custom_pos in norm_original_pos or norm_original_pos in custom_pos):
+                pos_score = 0.6
+            if not comp_score and (custom_comp in norm_original_comp or norm_original_comp in custom_comp):
+                comp_score = 0.6
+            
+            # Combined score (both position and company should match reasonably)
+            total_score = (pos_score + comp_score) / 2
+            
+            # Accept match if:
+            # 1. Position matches well (>=0.5) and company matches (>=0.3)
+            # 2. OR both match reasonably (>=0.4 each)
+            # 3. OR company matches exactly and position has good word overlap (>=0.4)
+            if (pos_score >= 0.5 and comp_score >= 0.3) or \
+               (pos_score >= 0.4 and comp_score >= 0.4) or \
+               (comp_score >= 0.8 and pos_score >= 0.4):
+                if total_score > best_score:
+                    best_score = total_score
+                    best_match = custom_exp
+                    if best_score >= 1.0:
+                        # Both fields match fully; no later candidate can score higher
+                        break
+        return best_match
+    
+    def _find_first_sections(self, sections: List[Dict[str, Any]], kinds: List[str]) -> Dict[str, int]:
+        """Index of the first section of each kind ('summary', 'experiences', 'projects') found, in one pass."""
+        predicates = {
+            'summary': self._section_has_summary_items,
+            'experiences': self._section_has_experience_items,
+            'projects': self._section_has_project_items,
+        }
+        pending = {kind: predicates[kind] for kind in kinds}
+        first = {}
+        for si, section in enumerate(sections):
+            if not pending:
+                break
+            for kind, predicate in list(pending.items()):
+                if predicate(section):
+                    first[kind] = si
+                    del pending[kind]
+        return first
+    
     def apply_updates(self, updates: Dict[str, Any]):
         """Apply customization updates to the resume."""
+        self._resume_content = None
         if not self.resume_data:
             self.load_resume_data()
-        else:
-            self.updater.data = copy.deepcopy(self.resume_data)
+        
+        # Locate the target section of every requested step in one pass, before any step edits items
+        sections = self.updater.data.get('sections', [])
+        kinds = [kind for kind in ('summary', 'experiences', 'projects') if kind in updates]
+        first = self._find_first_sections(sections, kinds)
         
         if 'summary' in updates:
-            summary_text = re.sub(r'<[^>]+>', '', updates['summary'])
-            for section in self.resume_data.get('sections', []):
-                if self._section_has_summary_items(section):
-                    if section.get('items'):
-                        # Update ALL summary items, not just the first one
-                        for item in section['items']:
-                            item['text'] = summary_text
-                    else:
-                        section['items'] = [{
-                            'id': 'summary_item',
-                            'record': 'SummaryItem',
-                            'text': summary_text,
-                            'height': 130,
-                            'alignment': 'left'
-                        }]
-                    break
-            
-            self.updater.data = copy.deepcopy(self.resume_data)
+            summary_text = _HTML_TAG_RE.sub('', updates['summary'])
+            if 'summary' in first:
+                section = sections[first['summary']]
+                if section.get('items'):
+                    # Update ALL summary items, not just the first one
+                    for item in section['items']:
+                        item['text'] = summary_text
+                else:
+                    section['items'] = [{
+                        'id': 'summary_item',
+                        'record': 'SummaryItem',
+                        'text': summary_text,
+                        'height': 130,
+                        'alignment': 'left'
+                    }]
         
         if 'experiences' in updates:
-            exp_section = None
-            for section in self.updater.data.get('sections', []):
-                if self._section_has_experience_items(section):
-                    exp_section = section
-                    break
+            exp_section = sections[first['experiences']] if 'experiences' in first else None
             
             if exp_section:
                 updated_count = 0
                 total_items = len(exp_section.get('items', []))
                 
-                # Create a mapping of custom experiences for easier lookup
-                # Use normalized strings for matching
-                custom_exp_map = {}
+                # Normalize each custom experience once (strings and word sets) for the matching below
+                norm_customs = []
                 for custom_exp in updates['experiences']:
                     norm_pos = normalize_for_matching(custom_exp.get('position', '') or custom_exp.get('title', ''))
                     norm_comp = normalize_for_matching(custom_exp.get('company', '') or custom_exp.get('workplace', ''))
-                    key = (norm_pos, norm_comp)
-                    custom_exp_map[key] = custom_exp
+                    norm_customs.append((norm_pos, norm_comp, _match_words(norm_pos), _match_words(norm_comp), custom_exp))
+                
+                # Create a mapping of custom experiences for easier lookup
+                # Use normalized strings for matching
+                custom_exp_map = {}
+                for norm_pos, norm_comp, _, _, custom_exp in norm_customs:
+                    custom_exp_map[(norm_pos, norm_comp)] = custom_exp
                 
                 # Update ALL experience items; use same keys as in PDF (position/title, workplace/company)
                 for item in exp_section.get('items', []):
@@ -864,58 +1458,8 @@ Return ONLY the JSON object, no additional text."""
                         item['location'] = original_location
                         updated_count += 1
                     else:
-                        best_match = None
-                        best_score = 0
-                        for custom_exp in updates['experiences']:
-                            custom_pos = normalize_for_matching(custom_exp.get('position', '') or custom_exp.get('title', ''))
-                            custom_comp = normalize_for_matching(custom_exp.get('company', '') or custom_exp.get('workplace', ''))
-                            
-                            # Calculate match score based on position and company similarity
-                            pos_score = 0
-                            comp_score = 0
-                            
-                            # Position matching: check if key words match
-                            # Filter out punctuation-only words (like '-', '.', etc.)
-                            pos_words_orig = {w for w in norm_original_pos.split() if w and not re.match(r'^[^\w]+$', w)}
-                            pos_words_custom = {w for w in custom_pos.split() if w and not re.match(r'^[^\w]+$', w)}
-                            if pos_words_orig and pos_words_custom:
-                                common_pos_words = pos_words_orig.intersection(pos_words_custom)
-                                # Calculate score based on common words
-                                pos_score = len(common_pos_words) / max(len(pos_words_orig), len(pos_words_custom))
-                                # If most key words match, boost the score
-                                if len(common_pos_words) >= 3:  # At least 3 common words
-                                    pos_score = max(pos_score, 0.6)
-                            
-                            # Company matching: check if key words match
-                            # Filter out punctuation-only words
-                            comp_words_orig = {w for w in norm_original_comp.split() if w and not re.match(r'^[^\w]+$', w)}
-                            comp_words_custom = {w for w in custom_comp.split() if w and not re.match(r'^[^\w]+$', w)}
-                            if comp_words_orig and comp_words_custom:
-                                common_comp_words = comp_words_orig.intersection(comp_words_custom)
-                                comp_score = len(common_comp_words) / max(len(comp_words_orig), len(comp_words_custom))
-                                # Company names are usually shorter, so be more lenient
-                                if len(common_comp_words) >= 1:  # At least 1 common word
-                                    comp_score = max(comp_score, 0.5)
-                            
-                            # Also try substring matching as fallback
-                            if not pos_score and (custom_pos in norm_original_pos or norm_original_pos in custom_pos):
-                                pos_score = 0.6
-                            if not comp_score and (custom_comp in norm_original_comp or norm_original_comp in custom_comp):
-                                comp_score = 0.6
-                            
-                            # Combined score (both position and company should match reasonably)
-                            total_score = (pos_score + comp_score) / 2
-                            
-                            # Accept match if:
-                            # 1. Position matches well (>=0.5) and company matches (>=0.3)
-                            # 2. OR both match reasonably (>=0.4 each)
-                            # 3. OR company matches exactly and position has good word overlap (>=0.4)
-                            if (pos_score >= 0.5 and comp_score >= 0.3) or \
-                               (pos_score >= 0.4 and comp_score >= 0.4) or \
-                               (comp_score >= 0.8 and pos_score >= 0.4):
-                                if total_score > best_score:
-                                    best_score = total_score
-                                    best_match = custom_exp
+                        best_match = self._fuzzy_match_experience(
+                            norm_original_pos, norm_original_comp, norm_customs)
                         
                         if best_match:
                             item['bullets'] = best_match.get('bullets', [])
@@ -930,17 +1474,13 @@ Return ONLY the JSON object, no additional text."""
                             item['dateRange'] = original_dateRange
                             item['location'] = original_location
                             updated_count += 1
-            
-            self.resume_data = copy.deepcopy(self.updater.data)
         
         if 'projects' in updates:
             _ensure_debug_log()
             proj_section = None
-            for si, section in enumerate(self.updater.data.get('sections', [])):
-                if self._section_has_project_items(section):
-                    proj_section = section
-                    _log.debug("apply_updates(projects): section found at index %s", si)
-                    break
+            if 'projects' in first:
+                proj_section = sections[first['projects']]
+                _log.debug("apply_updates(projects): section found at index %s", first['projects'])
             if not proj_section:
                 _log.debug("apply_updates(projects): NO project section found in updater.data")
 
@@ -965,6 +1505,7 @@ Return ONLY the JSON object, no additional text."""
                         it['projectName'] = title_to_set
 
                 # Apply by index (API returns same order as sent) - fixes duplicate titles and title mismatch
+                custom_by_title = None
                 for idx, item in enumerate(items):
                     original_title = item.get('title', '') or item.get('name', '') or item.get('projectName', '')
                     if not original_title:
@@ -975,22 +1516,20 @@ Return ONLY the JSON object, no additional text."""
                         set_proj_content(item, custom_list[idx], display_title)
                         _log.debug("apply_updates(projects): item[%s] applied by index, original_title=%r", idx, original_title[:50])
                     else:
-                        norm_original = normalize_for_matching(original_title)
-                        matched = False
-                        for custom_proj in custom_list:
-                            if normalize_for_matching(custom_proj.get('title', '')) == norm_original:
-                                set_proj_content(item, custom_proj, display_title)
-                                matched = True
-                                _log.debug("apply_updates(projects): item[%s] applied by title fallback", idx)
-                                break
-                        if not matched:
+                        if custom_by_title is None:
+                            # Normalize each custom title once; the first project with a given title wins
+                            custom_by_title = {}
+                            for custom_proj in custom_list:
+                                custom_by_title.setdefault(normalize_for_matching(custom_proj.get('title', '')), custom_proj)
+                        custom_proj = custom_by_title.get(normalize_for_matching(original_title))
+                        if custom_proj is not None:
+                            set_proj_content(item, custom_proj, display_title)
+                            _log.debug("apply_updates(projects): item[%s] applied by title fallback", idx)
+                        else:
                             _log.debug("apply_updates(projects): item[%s] NOT matched (idx >= len(custom_list) and no title match)", idx)
-
-            self.resume_data = copy.deepcopy(self.updater.data)
         
         if 'skills' in updates:
             self.updater.update_skills(updates['skills'])
-            self.resume_data = self.updater.data
     
     def save_customized_resume(self, output_path: str, job_title: Optional[str] = None, render_visual: bool = False) -> tuple:
         """Save the customized resume.
@@ -1006,11 +1545,9 @@ Return ONLY the JSON object, no additional text."""
         original_section_count = len(self.resume_data.get('sections', []))
         original_section_types = [s.get('__t', 'Unknown') for s in self.resume_data.get('sections', [])]
         
-        self.updater.data = copy.deepcopy(self.resume_data)
-        
         if job_title:
             self.updater.update_header(title=job_title)
-            self.resume_data = copy.deepcopy(self.updater.data)
+            self._resume_content = None
         
         # Verify sections are still present after updates (production: silent check)
         final_section_count = len(self.resume_data.get('sections', []))
@@ -1022,7 +1559,6 @@ Return ONLY the JSON object, no additional text."""
         # Ensure parent directory exists
         output_path_obj.parent.mkdir(parents=True, exist_ok=True)
         
-        self.updater.data = copy.deepcopy(self.resume_data)
         # Embed customized JSON into PDF (updater does not render visual)
         self.updater.save_pdf(output_path, render_visual=False)
         
@@ -1033,19 +1569,20 @@ Return ONLY the JSON object, no additional text."""
             visual_path = str(output_path_obj.with_suffix('.visual.pdf'))
             try:
                 from pdf_renderer import PDFRenderer
-                data_for_visual = copy.deepcopy(self.resume_data)
-                renderer = PDFRenderer(data_for_visual)
+                renderer = PDFRenderer(self.resume_data)
                 renderer.render_pdf(visual_path)
             except ImportError:
                 visual_error = "Visual PDF not available (install weasyprint or reportlab)."
             except Exception as e:
                 visual_error = str(e)
                 visual_path = None
-                try:
-                    import traceback
-                    traceback.print_exc()
-                except Exception:
-                    pass
+                # Full traceback only on request (set PDF_RESUME_DEBUG=1)
+                if os.environ.get('PDF_RESUME_DEBUG'):
+                    try:
+                        import traceback
+                        traceback.print_exc()
+                    except Exception:
+                        pass
         
         try:
             print(f"\n[OK] Customized resume saved to: {output_path}")
@@ -1070,18 +1607,13 @@ def extract_job_title(job_description: str) -> str:
     job_desc = clean_text(job_description)
     
     # Try to find job title patterns
-    patterns = [
-        r'(?:JOB\s*TITLE|Position|Title|Role|Job Title|POSITION|TITLE|ROLE)[:\s]+([^\n]+)',
-        r'^([A-Z][A-Za-z\s&]+(?:Engineer|Developer|Architect|Specialist|Manager|Analyst|Consultant|Lead|Senior|Junior)[^\n]*)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, job_desc, re.IGNORECASE | re.MULTILINE)
+    for pattern in _JOB_TITLE_PATTERNS:
+        match = pattern.search(job_desc)
         if match:
             title = match.group(1).strip()
             # Clean up the title
-            title = re.sub(r'[^\w\s\-&]', '', title)  # Remove special chars except - and &
-            title = re.sub(r'\s+', '_', title)  # Replace spaces with underscores
+            title = _NON_TITLE_CHARS_RE.sub('', title)  # Remove special chars except - and &
+            title = _WHITESPACE_RE.sub('_', title)  # Replace spaces with underscores
             title = title[:50]  # Limit length
             if title:
                 return title
@@ -1089,8 +1621,8 @@ def extract_job_title(job_description: str) -> str:
     # Fallback: use first line or first 50 chars
     first_line = job_desc.split('\n')[0].strip()
     if first_line:
-        title = re.sub(r'[^\w\s\-&]', '', first_line[:50])
-        title = re.sub(r'\s+', '_', title)
+        title = _NON_TITLE_CHARS_RE.sub('', first_line[:50])
+        title = _WHITESPACE_RE.sub('_', title)
         return title if title else "Unknown_Job"
     
     return "Unknown_Job"
@@ -1111,16 +1643,42 @@ def create_job_folder(base_dir: Optional[Path] = None) -> Path:
         base_dir = Path.cwd()
     
     jobs_dir = base_dir / "jobs"
-    jobs_dir.mkdir(exist_ok=True)
     
     # Create timestamped folder
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     job_folder = jobs_dir / f"{timestamp}_Job"
-    job_folder.mkdir(exist_ok=True)
+    job_folder.mkdir(parents=True, exist_ok=True)
     
     return job_folder
 
 
+# Linux FICLONE ioctl: share the source's extents copy-on-write (Btrfs, XFS, overlay on those)
+_FICLONE = 0x40049409 if sys.platform.startswith('linux') else None
+
+
+def _copy_file(src: Path, dst: Path):
+    """Copy src to dst with metadata, as a copy-on-write clone where the filesystem supports it.
+    
+    Not a hardlink: the root PDFs are rewritten in place on the next run, which would change
+    the job folder's snapshot too. Falls back to shutil.copy2 (sendfile on Linux).
+    """
+    import shutil
+    if _FICLONE is not None:
+        try:
+            import fcntl
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+# Longest file name organize_job_files writes into a job folder
+_JOB_FOLDER_LONGEST_FILE = "resume_customized.visual.pdf"
+
+
 def organize_job_files(
     job_description: str,
     resume_pdf_path: str,
@@ -1168,56 +1726,42 @@ def organize_job_files(
         base_dir = Path.cwd()
     
     jobs_dir = base_dir / "jobs"
-    jobs_dir.mkdir(exist_ok=True)
     
     # Create timestamped folder with job title
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     # Sanitize job title for folder name (Windows compatible)
     safe_title = sanitize_windows_filename(job_title, max_length=50)
-    safe_title = re.sub(r'\s+', '_', safe_title)
+    safe_title = _WHITESPACE_RE.sub('_', safe_title)
     
-    job_folder = jobs_dir / f"{timestamp}_{safe_title}"
-    # Sanitize full path for Windows
-    job_folder = sanitize_windows_path(job_folder)
+    # Sanitize the folder once, short enough that every fixed file name below still fits the
+    # Windows path limit; the files then need no sanitizing of their own
+    job_folder = sanitize_windows_path(
+        jobs_dir / f"{timestamp}_{safe_title}",
+        max_path_length=240 - len(_JOB_FOLDER_LONGEST_FILE) - 1
+    )
     job_folder.mkdir(parents=True, exist_ok=True)
     
-    # Save job description (Windows compatible)
+    # Save job description
     job_desc_path = job_folder / "job_description.txt"
     try:
         job_desc_path.write_text(job_description, encoding='utf-8', newline='\n')
     except Exception as e:
-        # Fallback: try with different encoding or path
-        try:
-            job_desc_path = sanitize_windows_path(job_desc_path)
-            job_desc_path.write_text(job_description, encoding='utf-8', newline='\n')
-        except Exception as e2:
-            raise IOError(f"Failed to save job description: {e2}")
+        raise IOError(f"Failed to save job description: {e}")
     
-    # Copy resume PDF (Windows compatible)
+    # Copy resume PDF
     resume_source = Path(resume_pdf_path)
     resume_dest = job_folder / "resume_customized.pdf"
     if resume_source.exists():
-        try:
-            shutil.copy2(resume_source, resume_dest)
-        except Exception as e:
-            # Retry with sanitized path
-            resume_dest = sanitize_windows_path(resume_dest)
-            shutil.copy2(resume_source, resume_dest)
+        _copy_file(resume_source, resume_dest)
     
-    # Copy visual PDF if provided (Windows compatible)
+    # Copy visual PDF if provided
     visual_dest = None
     if visual_pdf_path:
         visual_source = Path(visual_pdf_path)
         visual_dest = job_folder / "resume_customized.visual.pdf"
         if visual_source.exists():
-            try:
-                shutil.copy2(visual_source, visual_dest)
-                visual_dest = str(visual_dest)
-            except Exception as e:
-                # Retry with sanitized path
-                visual_dest = sanitize_windows_path(visual_dest)
-                shutil.copy2(visual_source, visual_dest)
-                visual_dest = str(visual_dest)
+            _copy_file(visual_source, visual_dest)
+            visual_dest = str(visual_dest)
     
     # Create metadata
     metadata = {
@@ -1230,14 +1774,7 @@ def organize_job_files(
     }
     
     metadata_path = job_folder / "metadata.json"
-    try:
-        with open(metadata_path, 'w', encoding='utf-8', newline='\n') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-    except Exception as e:
-        # Retry with sanitized path
-        metadata_path = sanitize_windows_path(metadata_path)
-        with open(metadata_path, 'w', encoding='utf-8', newline='\n') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+    _write_json_file(metadata_path, metadata)
     
     result = {
         'folder': str(job_folder),
@@ -1261,6 +1798,8 @@ def read_job_description(file_path: str) -> str:
 
 
 def main():
+    import argparse
+    
     # Setup Windows console for UTF-8 if needed
     setup_windows_console()
     
@@ -1282,6 +1821,10 @@ Examples:
   # Use specific OpenAI model
   python resume_customizer.py resume.pdf --job-desc job.txt \\
     --model gpt-4 --output customized.pdf
+  
+  # Request all sections in a single OpenAI call
+  python resume_customizer.py resume.pdf --job-desc job.txt \\
+    --single-request --output customized.pdf
         """
     )
     
@@ -1307,6 +1850,8 @@ Examples:
                        help='Skip experience customization')
     parser.add_argument('--no-skills', action='store_true',
                        help='Skip skills prioritization')
+    parser.add_argument('--single-request', action='store_true',
+                       help='Customize all sections with one OpenAI request instead of one per section')
     
     args = parser.parse_args()
     
@@ -1326,7 +1871,8 @@ Examples:
             customize_summary=not args.no_summary,
             customize_experience=not args.no_experience,
             customize_skills=not args.no_skills,
-            model=args.model
+            model=args.model,
+            single_request=args.single_request
         )
         
         print("\nApplying updates to resume...")
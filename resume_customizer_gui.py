@@ -90,7 +90,8 @@ class CustomizationWorker(QThread):
                 customize_experience=self.customize_experience,
                 customize_skills=self.customize_skills,
                 customize_projects=True,  # Always customize projects
-                model=self.model
+                model=self.model,
+                progress=self.progress.emit
             )
             
             self.progress.emit("Applying updates...")